@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models.functions import Substr
 from .models import Conversation, Message
 
 @admin.register(Conversation)
@@ -17,6 +18,14 @@ class MessageAdmin(admin.ModelAdmin):
     raw_id_fields = ('conversation', 'sender')
     readonly_fields = ('id', 'timestamp')
     
+    def get_queryset(self, request):
+        # Compute the preview in the database so the changelist never loads
+        # full message bodies
+        return super().get_queryset(request).only(
+            'id', 'sender', 'conversation', 'timestamp', 'is_read'
+        ).annotate(content_preview=Substr('content', 1, 53))
+
     def short_content(self, obj):
-        return obj.content[:50] + '...' if len(obj.content) > 50 else obj.content
+        preview = obj.content_preview
+        return preview[:50] + '...' if len(preview) > 50 else preview
     short_content.short_description = 'Content'
\ No newline at end of file
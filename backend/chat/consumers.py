@@ -1,19 +1,96 @@
-import json
+import asyncio
+import base64
+import gzip
+import orjson
+import time
 from channels.generic.websocket import AsyncWebsocketConsumer
-from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 import logging
 from asgiref.sync import sync_to_async
 from .models import Conversation, Message  
 logger = logging.getLogger('channels')
 User = get_user_model()
 
+def orjson_dumps(data):
+    """
+    Encode a frame with orjson; it returns bytes, Channels text frames want str
+    """
+    return orjson.dumps(data).decode()
+
+# Chat message bodies above this size get gzipped before broadcast
+COMPRESS_THRESHOLD_BYTES = 1024
+
+# Flush pending chat frames after this window or at this many frames
+BATCH_FLUSH_SECONDS = 0.02
+BATCH_MAX_FRAMES = 32
+
+class GroupSendBatcher:
+    """
+    Coalesces group_sends to the same group within a short window so a
+    burst of messages costs one channel-layer operation (and one
+    WebSocket frame per recipient) instead of one per message
+    """
+    def __init__(self):
+        self._pending = {}  # group name -> list of message payloads
+        self._drain_tasks = {}  # group name -> pending flush task
+
+    async def enqueue(self, channel_layer, group, payload):
+        frames = self._pending.setdefault(group, [])
+        frames.append(payload)
+        if len(frames) >= BATCH_MAX_FRAMES:
+            await self._flush(channel_layer, group)
+        elif group not in self._drain_tasks:
+            self._drain_tasks[group] = asyncio.create_task(
+                self._drain_later(channel_layer, group)
+            )
+
+    async def _drain_later(self, channel_layer, group):
+        try:
+            await asyncio.sleep(BATCH_FLUSH_SECONDS)
+            await self._flush(channel_layer, group)
+        except asyncio.CancelledError:
+            pass
+
+    async def _flush(self, channel_layer, group):
+        frames = self._pending.pop(group, [])
+        drain_task = self._drain_tasks.pop(group, None)
+        if drain_task and drain_task is not asyncio.current_task():
+            drain_task.cancel()
+        if frames:
+            await channel_layer.group_send(group, {
+                'type': 'chat_messages',
+                'text_data': orjson_dumps({
+                    'type': 'chat_messages',
+                    'messages': frames,
+                }),
+            })
+
+message_batcher = GroupSendBatcher()
+
+def compress_message_field(frame):
+    """
+    Gzip and base64-encode a large 'message' field in place.
+    Frames are flagged with encoding='gzip' so clients know to inflate.
+    """
+    content = frame['message'].encode()
+    if len(content) > COMPRESS_THRESHOLD_BYTES:
+        frame['message'] = base64.b64encode(gzip.compress(content)).decode('ascii')
+        frame['encoding'] = 'gzip'
+    return frame
+
 class ChatConsumer(AsyncWebsocketConsumer):
+    # Minimum seconds between repeated same-state typing broadcasts
+    TYPING_DEBOUNCE_SECONDS = 1.5
+
     async def connect(self):
         """
         Connect to a WebSocket for a specific chat conversation
         """
         self.user = self.scope["user"]
+        self._last_typing_state = None
+        self._last_typing_sent_at = 0.0
+        self._typing_reset_task = None
         logger.debug(f"WebSocket connect attempt by user: {self.user}")
         
         # Reject the connection if the user is not authenticated
@@ -53,8 +130,11 @@ class ChatConsumer(AsyncWebsocketConsumer):
             self.room_group_name,
             {
                 'type': 'user_join',
-                'user_id': self.user.id,
-                'username': self.user.username,
+                'text_data': orjson_dumps({
+                    'type': 'user_join',
+                    'user_id': self.user.id,
+                    'username': self.user.username,
+                }),
             }
         )
     
@@ -62,10 +142,15 @@ class ChatConsumer(AsyncWebsocketConsumer):
         """
         Handle WebSocket disconnect
         """
+        # Cancel any pending typing auto-clear
+        if getattr(self, '_typing_reset_task', None):
+            self._typing_reset_task.cancel()
+            self._typing_reset_task = None
+
         # Leave room group
         if hasattr(self, 'room_group_name') and hasattr(self, 'user') and not self.user.is_anonymous:
             logger.info(f"User {self.user.username} disconnected from conversation {getattr(self, 'conversation_id', 'unknown')}")
-            
+
             await self.channel_layer.group_discard(
                 self.room_group_name,
                 self.channel_name
@@ -76,8 +161,11 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 self.room_group_name,
                 {
                     'type': 'user_leave',
-                    'user_id': self.user.id,
-                    'username': self.user.username,
+                    'text_data': orjson_dumps({
+                        'type': 'user_leave',
+                        'user_id': self.user.id,
+                        'username': self.user.username,
+                    }),
                 }
             )
     
@@ -87,7 +175,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
         Receive message from WebSocket and forward to group
         """
         try:
-            data = json.loads(text_data)
+            data = orjson.loads(text_data)
             message_type = data.get('type', 'chat_message')
             
             if message_type == 'chat_message':
@@ -102,39 +190,61 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 try:
                     message_obj = await self.save_message(message)
                     
-                    # Send message to room group
-                    await self.channel_layer.group_send(
+                    # Queue the message for the room group; consecutive
+                    # messages to the same conversation within the flush
+                    # window ride a single group_send
+                    await message_batcher.enqueue(
+                        self.channel_layer,
                         self.room_group_name,
-                        {
+                        compress_message_field({
                             'type': 'chat_message',
                             'message': message,
                             'user_id': self.user.id,
                             'username': self.user.username,
                             'message_id': str(message_obj.id),
                             'timestamp': message_obj.timestamp.isoformat(),
-                        }
+                        })
                     )
                 except Exception as e:
                     logger.error(f"Error saving message: {str(e)}")
-                    await self.send(text_data=json.dumps({
+                    await self.send(text_data=orjson_dumps({
                         'type': 'error',
                         'message': 'Failed to save message',
                     }))
                     
             elif message_type == 'typing':
-                # Broadcast typing status
+                # Broadcast typing status, debounced so repeated keystrokes
+                # don't flood the channel layer with redundant fanouts
+                is_typing = data.get('is_typing', False)
+                now = time.monotonic()
+                if (is_typing == self._last_typing_state
+                        and now - self._last_typing_sent_at < self.TYPING_DEBOUNCE_SECONDS):
+                    return
+
                 logger.debug(f"User {self.user.username} typing status update in conversation {self.conversation_id}")
-                
+
+                self._last_typing_state = is_typing
+                self._last_typing_sent_at = now
                 await self.channel_layer.group_send(
                     self.room_group_name,
                     {
                         'type': 'user_typing',
-                        'user_id': self.user.id,
-                        'username': self.user.username,
-                        'is_typing': data.get('is_typing', False)
+                        'text_data': orjson_dumps({
+                            'type': 'typing',
+                            'user_id': self.user.id,
+                            'username': self.user.username,
+                            'is_typing': is_typing,
+                        }),
                     }
                 )
-        except json.JSONDecodeError:
+
+                # Auto-clear a stuck is_typing=True if no follow-up arrives
+                if self._typing_reset_task:
+                    self._typing_reset_task.cancel()
+                    self._typing_reset_task = None
+                if is_typing:
+                    self._typing_reset_task = asyncio.create_task(self.clear_typing_later())
+        except orjson.JSONDecodeError:
             logger.error(f"Invalid JSON received from user {self.user.username}")
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}")
@@ -144,80 +254,97 @@ class ChatConsumer(AsyncWebsocketConsumer):
         """
         Send message to WebSocket
         """
-        # Send message to WebSocket
-        await self.send(text_data=json.dumps({
-            'type': 'chat_message',
-            'message': event['message'],
-            'user_id': event['user_id'],
-            'username': event['username'],
-            'message_id': event['message_id'],
-            'timestamp': event['timestamp'],
-        }))
-    
+        # Frame was encoded once by the producer
+        await self.send(text_data=event['text_data'])
+
+    # Event handler for batched chat messages
+    async def chat_messages(self, event):
+        """
+        Send a batch of chat messages in one WebSocket frame
+        """
+        await self.send(text_data=event['text_data'])
+
     # Event handler for user join notifications
     async def user_join(self, event):
         """
         Send user join notification to WebSocket
         """
-        await self.send(text_data=json.dumps({
-            'type': 'user_join',
-            'user_id': event['user_id'],
-            'username': event['username'],
-        }))
-    
+        await self.send(text_data=event['text_data'])
+
     # Event handler for user leave notifications
     async def user_leave(self, event):
         """
         Send user leave notification to WebSocket
         """
-        await self.send(text_data=json.dumps({
-            'type': 'user_leave',
-            'user_id': event['user_id'],
-            'username': event['username'],
-        }))
-    
+        await self.send(text_data=event['text_data'])
+
     # Event handler for typing status
     async def user_typing(self, event):
         """
         Send typing status to WebSocket
         """
-        await self.send(text_data=json.dumps({
-            'type': 'typing',
-            'user_id': event['user_id'],
-            'username': event['username'],
-            'is_typing': event['is_typing'],
-        }))
-    
+        await self.send(text_data=event['text_data'])
+
+    async def clear_typing_later(self):
+        """
+        Broadcast is_typing=False if the user stops sending typing events,
+        so a stuck 'typing...' indicator clears itself
+        """
+        try:
+            await asyncio.sleep(self.TYPING_DEBOUNCE_SECONDS * 2)
+            self._last_typing_state = False
+            self._last_typing_sent_at = time.monotonic()
+            await self.channel_layer.group_send(
+                self.room_group_name,
+                {
+                    'type': 'user_typing',
+                    'text_data': orjson_dumps({
+                        'type': 'typing',
+                        'user_id': self.user.id,
+                        'username': self.user.username,
+                        'is_typing': False,
+                    }),
+                }
+            )
+        except asyncio.CancelledError:
+            pass
+
     # Database operations
-    @database_sync_to_async
-    def save_message(self, content):
+    async def save_message(self, content):
         """
-        Save message to database
+        Save message to database with the async ORM, staying on the event
+        loop instead of hopping to the thread pool
         """
         try:
-            conversation = Conversation.objects.get(id=self.conversation_id)
-            message = Message.objects.create(
-                conversation=conversation,
+            # Pass the FK id directly - the conversation was already
+            # validated at connect, so no need to fetch it again
+            return await Message.objects.acreate(
+                conversation_id=self.conversation_id,
                 sender=self.user,
                 content=content,
                 is_read=False
             )
-            return message
         except Exception as e:
             logger.error(f"Error saving message: {str(e)}")
             raise
-    
-    @database_sync_to_async
-    def user_in_conversation(self, user_id, conversation_id):
+
+    async def user_in_conversation(self, user_id, conversation_id):
         """
-        Check if user is a participant in the conversation
+        Check if user is a participant in the conversation.
+        Hits the M2M table directly with a single EXISTS and caches the
+        result briefly so reconnects skip the DB; the cache is invalidated
+        in signals.py when participants change.
         """
         try:
-            conversation = Conversation.objects.get(id=conversation_id)
-            return conversation.participants.filter(id=user_id).exists()
-        except Conversation.DoesNotExist:
-            logger.warning(f"Conversation {conversation_id} does not exist")
-            return False
+            cache_key = f'cmem:{user_id}:{conversation_id}'
+            is_member = await cache.aget(cache_key)
+            if is_member is None:
+                is_member = await Conversation.participants.through.objects.filter(
+                    conversation_id=conversation_id,
+                    user_id=user_id
+                ).aexists()
+                await cache.aset(cache_key, is_member, 60)
+            return is_member
         except Exception as e:
             logger.error(f"Error checking if user is in conversation: {str(e)}")
             return False
@@ -225,59 +352,175 @@ class ChatConsumer(AsyncWebsocketConsumer):
 
 class OnlineStatusConsumer(AsyncWebsocketConsumer):
     """
-    Consumer for tracking online status of users
+    Consumer for tracking online status of users.
+    Presence lives in a cache-backed set: connecting clients get one
+    snapshot of who is online, and the group only hears a delta when a
+    user actually transitions online/offline - extra tabs or reconnects
+    don't re-broadcast to everyone.
     """
+    PRESENCE_KEY = 'presence:online'
+    # Presence entries expire if not refreshed by connect/disconnect
+    # activity, so a worker that dies without running disconnect can't
+    # leave users marked online forever
+    PRESENCE_TTL = 6 * 3600
+
     async def connect(self):
         self.user = self.scope["user"]
-        
+
         # Reject the connection if the user is not authenticated
         if self.user.is_anonymous:
             logger.warning("Online status WebSocket connection rejected: Anonymous user")
             await self.close(code=4001)
             return
-            
+
         self.room_group_name = 'online_status'
         logger.info(f"User {self.user.username} connecting to online status")
-        
+
         # Join room group
         await self.channel_layer.group_add(
             self.room_group_name,
             self.channel_name
         )
-        
+
         await self.accept()
-        
-        # Broadcast user's online status
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                'type': 'user_status',
-                'user_id': self.user.id,
-                'username': self.user.username,
-                'status': 'online',
-            }
-        )
-    
-    async def disconnect(self, close_code):
-        if hasattr(self, 'room_group_name') and hasattr(self, 'user') and not self.user.is_anonymous:
-            logger.info(f"User {self.user.username} disconnected from online status")
-            
-            # Broadcast user's offline status
+
+        came_online = await self.presence_connect(self.user.id)
+
+        # Send the caller a snapshot instead of relying on broadcasts
+        online_ids = await self.online_user_ids()
+        await self.send(text_data=orjson_dumps({
+            'type': 'online_snapshot',
+            'user_ids': online_ids,
+        }))
+
+        # Broadcast only the offline->online transition
+        if came_online:
             await self.channel_layer.group_send(
                 self.room_group_name,
                 {
                     'type': 'user_status',
-                    'user_id': self.user.id,
-                    'username': self.user.username,
-                    'status': 'offline',
+                    'text_data': orjson_dumps({
+                        'type': 'user_status',
+                        'user_id': self.user.id,
+                        'username': self.user.username,
+                        'status': 'online',
+                    }),
                 }
             )
-            
+
+    async def disconnect(self, close_code):
+        if hasattr(self, 'room_group_name') and hasattr(self, 'user') and not self.user.is_anonymous:
+            logger.info(f"User {self.user.username} disconnected from online status")
+
+            # Broadcast only the online->offline transition (last connection)
+            went_offline = await self.presence_disconnect(self.user.id)
+            if went_offline:
+                await self.channel_layer.group_send(
+                    self.room_group_name,
+                    {
+                        'type': 'user_status',
+                        'text_data': orjson_dumps({
+                            'type': 'user_status',
+                            'user_id': self.user.id,
+                            'username': self.user.username,
+                            'status': 'offline',
+                        }),
+                    }
+                )
+
             # Leave room group
             await self.channel_layer.group_discard(
                 self.room_group_name,
                 self.channel_name
             )
+
+    def _count_connect(self, count_key):
+        """
+        Bump the user's connection counter and return the new count.
+        Runs sync via sync_to_async: the backend's sync incr is atomic
+        (a lock for locmem, INCR for Redis) while BaseCache's async
+        variants are a non-atomic get/set pair
+        """
+        # add() seeds the counter only when absent, so concurrent
+        # connects all funnel through the atomic incr
+        cache.add(count_key, 0, self.PRESENCE_TTL)
+        try:
+            count = cache.incr(count_key)
+        except ValueError:
+            # Counter expired between add and incr; reseed
+            cache.set(count_key, 1, self.PRESENCE_TTL)
+            count = 1
+        cache.touch(count_key, self.PRESENCE_TTL)
+        return count
+
+    def _count_disconnect(self, count_key):
+        """
+        Drop the user's connection counter and return the new count.
+        Sync for the same atomicity reasons as _count_connect
+        """
+        try:
+            count = cache.decr(count_key)
+        except ValueError:
+            # Counter already expired (e.g. worker restart); treat the
+            # user as offline
+            count = 0
+        if count > 0:
+            cache.touch(count_key, self.PRESENCE_TTL)
+        else:
+            cache.delete(count_key)
+        return count
+
+    async def presence_connect(self, user_id):
+        """
+        Record a connection in the presence set.
+        Returns True if this is the user's first open connection
+        """
+        count = await sync_to_async(self._count_connect)(
+            f'presence:conns:{user_id}'
+        )
+
+        # The id list is only a candidate index for snapshots - the
+        # counters are authoritative - so re-adding on every connect also
+        # repairs entries lost to concurrent writes
+        online_ids = await cache.aget(self.PRESENCE_KEY) or []
+        if user_id not in online_ids:
+            online_ids.append(user_id)
+        await cache.aset(self.PRESENCE_KEY, online_ids, self.PRESENCE_TTL)
+        return count == 1
+
+    async def presence_disconnect(self, user_id):
+        """
+        Record a disconnect in the presence set.
+        Returns True if this was the user's last open connection
+        """
+        count = await sync_to_async(self._count_disconnect)(
+            f'presence:conns:{user_id}'
+        )
+        if count > 0:
+            return False
+
+        online_ids = await cache.aget(self.PRESENCE_KEY) or []
+        if user_id in online_ids:
+            online_ids.remove(user_id)
+            await cache.aset(self.PRESENCE_KEY, online_ids, self.PRESENCE_TTL)
+        return True
+
+    async def online_user_ids(self):
+        """
+        Build the online snapshot from the per-user counters.
+        The candidate list may lag or hold stale ids; only users whose
+        counter is still live count as online, and pruned entries are
+        written back so the list self-heals
+        """
+        candidates = await cache.aget(self.PRESENCE_KEY) or []
+        online_ids = []
+        for user_id in candidates:
+            count = await cache.aget(f'presence:conns:{user_id}') or 0
+            if count > 0:
+                online_ids.append(user_id)
+        if len(online_ids) != len(candidates):
+            await cache.aset(self.PRESENCE_KEY, online_ids, self.PRESENCE_TTL)
+        return online_ids
     
     # Event handler for user status updates
     async def user_status(self, event):
@@ -285,9 +528,4 @@ class OnlineStatusConsumer(AsyncWebsocketConsumer):
         Send status to WebSocket
         """
         # Send status to WebSocket
-        await self.send(text_data=json.dumps({
-            'type': 'user_status',
-            'user_id': event['user_id'],
-            'username': event['username'],
-            'status': event['status'],
-        }))
\ No newline at end of file
+        await self.send(text_data=event['text_data'])
\ No newline at end of file
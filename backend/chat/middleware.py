@@ -1,9 +1,13 @@
 from channels.db import database_sync_to_async
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from channels.middleware import BaseMiddleware
 from channels.auth import AuthMiddlewareStack
+import hashlib
 import jwt
+import time
+from urllib.parse import parse_qs
 from django.conf import settings
 import logging
 
@@ -13,25 +17,38 @@ User = get_user_model()
 @database_sync_to_async
 def get_user_from_token(token):
     try:
+        # Check the cache first so repeat connects with the same token
+        # skip the DB lookup entirely
+        cache_key = 'wsuser:' + hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+        cached_user = cache.get(cache_key)
+        if cached_user is not None:
+            return cached_user
+
         # Validate the token and get the user ID
         # Using the same secret key as your JWT settings
         decoded_data = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
+            token,
+            settings.SECRET_KEY,
             algorithms=["HS256"]
         )
         user_id = decoded_data.get('user_id')
-        
+
         if not user_id:
             # Try another common field name
             user_id = decoded_data.get('id') or decoded_data.get('sub')
-            
+
         if not user_id:
             logger.warning(f"Could not find user_id in JWT token: {decoded_data}")
             return AnonymousUser()
-            
+
         # Get the user from the database
         user = User.objects.get(id=user_id)
+
+        # Cache the user until the token expires
+        timeout = decoded_data.get('exp', 0) - time.time()
+        if timeout > 0:
+            cache.set(cache_key, user, timeout)
+
         return user
     except jwt.InvalidTokenError:
         logger.warning("Invalid JWT token")
@@ -48,18 +65,11 @@ def get_user_from_token(token):
 
 class JwtAuthMiddleware(BaseMiddleware):
     async def __call__(self, scope, receive, send):
-        # Get the token from the query string
-        query_string = scope.get("query_string", b"").decode()
-        query_params = {}
-        
-        # Parse query parameters
-        for param in query_string.split('&'):
-            if param:
-                key, value = param.split('=', 1) if '=' in param else (param, '')
-                query_params[key] = value
-        
-        token = query_params.get("token", None)
-        
+        # Get the token from the query string; parse_qs handles
+        # percent-decoding and tokens containing '=' correctly
+        query_string = scope.get("query_string", b"").decode('ascii', 'ignore')
+        token = parse_qs(query_string).get("token", [None])[0]
+
         if token:
             # Get the user from the token
             scope["user"] = await get_user_from_token(token)
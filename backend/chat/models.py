@@ -25,6 +25,10 @@ class Conversation(models.Model):
     @property
     def last_message(self):
         """Get the last message of this conversation"""
+        # Prefer the message attached in bulk by ConversationViewSet.list
+        # so the list endpoint doesn't run one query per conversation
+        if hasattr(self, '_last_message'):
+            return self._last_message
         return self.messages.order_by('-timestamp').first()
 
 class Message(models.Model):
@@ -40,7 +44,13 @@ class Message(models.Model):
     
     class Meta:
         ordering = ['timestamp']
-    
+        indexes = [
+            # Covers ordering/last_message lookups per conversation
+            models.Index(fields=['conversation', '-timestamp'], name='msg_conv_ts_idx'),
+            # Covers the unread-count aggregate and mark_read filter
+            models.Index(fields=['conversation', 'is_read', 'sender'], name='msg_conv_unread_idx'),
+        ]
+
     def __str__(self):
         return f"{self.sender.username}: {self.content[:20]}"
 
@@ -1,5 +1,7 @@
+import uuid
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db.models import Count, OuterRef, Subquery
 from .models import Conversation, Message
 
 User = get_user_model()
@@ -29,20 +31,14 @@ class ConversationSerializer(serializers.ModelSerializer):
     """
     participants = UserSerializer(many=True, read_only=True)
     last_message = MessageSerializer(read_only=True)
-    unread_count = serializers.SerializerMethodField()
+    # Reads the unread_count annotation from ConversationViewSet.get_queryset
+    unread_count = serializers.IntegerField(read_only=True, default=0)
     
     class Meta:
         model = Conversation
         fields = ['id', 'name', 'participants', 'created_at', 'updated_at', 'is_group', 'last_message', 'unread_count']
         read_only_fields = ['id', 'created_at', 'updated_at']
-        
-    def get_unread_count(self, obj):
-        """
-        Get the number of unread messages for the requesting user
-        """
-        user = self.context.get('request').user
-        return obj.messages.filter(is_read=False).exclude(sender=user).count()
-        
+
 class ConversationCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating a new conversation
@@ -70,10 +66,27 @@ class ConversationCreateSerializer(serializers.ModelSerializer):
             
         return value
         
+    @staticmethod
+    def _normalize_id(value):
+        """
+        Canonicalize a participant id to the User pk type.
+        UUIDField coerces integer ids to UUID(int=n) during validation
+        while request.user.id stays the raw pk, so without this mapping
+        the requester's own id would look like a distinct second user
+        """
+        if (isinstance(value, uuid.UUID)
+                and User._meta.pk.get_internal_type() != 'UUIDField'):
+            return value.int
+        return value
+
     def create(self, validated_data):
         participant_ids = validated_data.pop('participant_ids')
         user = self.context['request'].user
-        
+
+        # Put every id in the same type space as user.id so the
+        # membership and distinctness checks compare like with like
+        participant_ids = [self._normalize_id(pid) for pid in participant_ids]
+
         # Add requesting user to participants
         if user.id not in participant_ids:
             participant_ids.append(user.id)
@@ -81,16 +94,31 @@ class ConversationCreateSerializer(serializers.ModelSerializer):
         is_group = validated_data.get('is_group', False) or len(participant_ids) > 2
         validated_data['is_group'] = is_group
         
-        # For direct messages, check if conversation already exists
-        if not is_group and len(participant_ids) == 2:
-            conversations = Conversation.objects.filter(is_group=False)
-            for conversation in conversations:
-                participants = conversation.participants.all()
-                if participants.count() == 2:
-                    participant_ids_set = set(participant_ids)
-                    conversation_participant_ids = set(str(p.id) for p in participants)
-                    if participant_ids_set == conversation_participant_ids:
-                        return conversation
+        # For direct messages, check if conversation already exists.
+        # Two participant joins find the pair in one query instead of
+        # scanning every non-group conversation; both ids must be distinct
+        # or the two joins would match any DM containing the requester.
+        # The total is counted with an independent subquery over the
+        # through table - Count('participants') would reuse the filtered
+        # joins and always see one row per conversation.
+        if not is_group and len(set(participant_ids)) == 2:
+            user_a, user_b = participant_ids
+            participant_total = Conversation.participants.through.objects.filter(
+                conversation_id=OuterRef('pk')
+            ).values('conversation_id').annotate(
+                total=Count('pk')
+            ).values('total')
+            existing = Conversation.objects.filter(
+                is_group=False
+            ).filter(
+                participants=user_a
+            ).filter(
+                participants=user_b
+            ).annotate(
+                participant_count=Subquery(participant_total)
+            ).filter(participant_count=2).first()
+            if existing:
+                return existing
         
         # Create the conversation
         conversation = Conversation.objects.create(**validated_data)
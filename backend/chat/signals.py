@@ -1,40 +1,35 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, m2m_changed
 from django.dispatch import receiver
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
-import json
+from django.core.cache import cache
+from django.utils import timezone
 import logging
 from .models import Message, Conversation
 
 logger = logging.getLogger('channels')
 
+@receiver(m2m_changed, sender=Conversation.participants.through)
+def conversation_participants_changed(sender, instance, action, pk_set, **kwargs):
+    """
+    Invalidate cached membership checks when participants are added or removed
+    """
+    if action in ('post_add', 'post_remove') and pk_set:
+        cache.delete_many([f'cmem:{user_id}:{instance.id}' for user_id in pk_set])
+
 @receiver(post_save, sender=Message)
 def message_post_save(sender, instance, created, **kwargs):
     """
-    When a new message is created, send a notification to the channel layer
+    When a new message is created, bump its conversation's updated_at.
+    The WebSocket broadcast happens in ChatConsumer.receive, which already
+    group_sends the message - broadcasting here as well would deliver every
+    message twice.
     """
     if created:
         try:
-            # Get the channel layer
-            channel_layer = get_channel_layer()
-            conversation_id = str(instance.conversation.id)
-            
-            # Notify all users in this conversation about the new message
-            async_to_sync(channel_layer.group_send)(
-                f'chat_{conversation_id}',
-                {
-                    'type': 'chat_message',
-                    'message': instance.content,
-                    'user_id': str(instance.sender.id),
-                    'username': instance.sender.username,
-                    'message_id': str(instance.id),
-                    'timestamp': instance.timestamp.isoformat(),
-                }
+            # Update the conversation's updated_at timestamp with a targeted
+            # UPDATE; avoids materializing the conversation and refiring its
+            # post_save signals
+            Conversation.objects.filter(pk=instance.conversation_id).update(
+                updated_at=timezone.now()
             )
-            
-            # Update the conversation's updated_at timestamp
-            instance.conversation.save(update_fields=['updated_at'])
-            
-            logger.info(f"Message notification sent to conversation {conversation_id}")
         except Exception as e:
-            logger.error(f"Error sending message notification: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error updating conversation timestamp: {str(e)}")
\ No newline at end of file
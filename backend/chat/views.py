@@ -1,13 +1,22 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Q, Max, OuterRef, Subquery
+from django.db.models import Count, Q, Max, OuterRef, Subquery
+from django.utils.dateparse import parse_datetime
 from .models import Conversation, Message
 from .serializers import ConversationSerializer, MessageSerializer, ConversationCreateSerializer
 import logging
 
 logger = logging.getLogger('django.request')
 
+# Columns MessageSerializer actually renders; used with .only() to keep
+# message rows narrow on read paths
+MESSAGE_FIELDS = (
+    'id', 'conversation', 'content', 'timestamp', 'is_read',
+    'sender__id', 'sender__username', 'sender__email',
+    'sender__first_name', 'sender__last_name',
+)
+
 class ConversationViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing conversations
@@ -19,9 +28,38 @@ class ConversationViewSet(viewsets.ModelViewSet):
         Get conversations for the current user
         """
         user = self.request.user
+        last_message = Message.objects.filter(
+            conversation=OuterRef('pk')
+        ).order_by('-timestamp').values('id')[:1]
         return Conversation.objects.filter(
             participants=user
+        ).annotate(
+            unread_count=Count(
+                'messages',
+                filter=Q(messages__is_read=False) & ~Q(messages__sender=user)
+            ),
+            last_message_id=Subquery(last_message)
         ).prefetch_related('participants')
+
+    def list(self, request, *args, **kwargs):
+        """
+        List conversations with their last messages fetched in a single query
+        """
+        conversations = list(self.filter_queryset(self.get_queryset()))
+
+        # Fetch all last messages in one query and attach them
+        last_message_ids = [c.last_message_id for c in conversations if c.last_message_id]
+        messages_by_id = {
+            message.id: message
+            for message in Message.objects.filter(
+                id__in=last_message_ids
+            ).select_related('sender').only(*MESSAGE_FIELDS)
+        }
+        for conversation in conversations:
+            conversation._last_message = messages_by_id.get(conversation.last_message_id)
+
+        serializer = self.get_serializer(conversations, many=True)
+        return Response(serializer.data)
     
     def get_serializer_class(self):
         """
@@ -42,12 +80,41 @@ class ConversationViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def messages(self, request, pk=None):
         """
-        Get all messages for a conversation
+        Get messages for a conversation, one page at a time.
+        Supports keyset pagination via ?before=<iso timestamp>&limit=<n>;
+        each page is the newest messages before the cursor, returned in
+        chronological order.
         """
         try:
             conversation = self.get_object()
-            messages = conversation.messages.all().select_related('sender')
-            serializer = MessageSerializer(messages, many=True)
+            # Load only the columns the serializer renders - no need to pull
+            # wide sender rows for long histories
+            messages = conversation.messages.all().select_related('sender').only(*MESSAGE_FIELDS)
+
+            before = request.query_params.get('before')
+            if before:
+                cursor = parse_datetime(before)
+                if cursor is None:
+                    return Response(
+                        {"error": "Invalid 'before' timestamp"},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                messages = messages.filter(timestamp__lt=cursor)
+
+            try:
+                limit = int(request.query_params.get('limit', 50))
+            except ValueError:
+                limit = 50
+            # Clamp to [0, 200]; a negative slice would raise and turn a
+            # bad query string into a 500
+            limit = max(0, min(limit, 200))
+
+            # Newest-first rides the (conversation, -timestamp) index; the
+            # page is reversed so clients still get oldest-to-newest
+            page = list(messages.order_by('-timestamp')[:limit])
+            page.reverse()
+
+            serializer = MessageSerializer(page, many=True)
             return Response(serializer.data)
         except Exception as e:
             logger.error(f"Error getting messages: {str(e)}")
@@ -63,16 +130,12 @@ class ConversationViewSet(viewsets.ModelViewSet):
         """
         try:
             conversation = self.get_object()
-            messages = conversation.messages.filter(
+            # Single UPDATE instead of one save() per message; bulk update()
+            # also skips post_save signals, which we don't want for reads
+            count = conversation.messages.filter(
                 is_read=False
-            ).exclude(sender=request.user)
-            
-            count = 0
-            for message in messages:
-                message.is_read = True
-                message.save(update_fields=['is_read'])
-                count += 1
-                
+            ).exclude(sender=request.user).update(is_read=True)
+
             return Response({"marked_read": count})
         except Exception as e:
             logger.error(f"Error marking messages as read: {str(e)}")
@@ -99,7 +162,7 @@ class MessageViewSet(viewsets.ModelViewSet):
         return Message.objects.filter(
             conversation_id=conversation_id,
             conversation__participants=self.request.user
-        ).select_related('sender')
+        ).select_related('sender').only(*MESSAGE_FIELDS)
     
     def perform_create(self, serializer):
         """
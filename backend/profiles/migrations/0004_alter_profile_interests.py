@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-09-01 23:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_alter_profile_status_message_alter_profile_username'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='profile',
+            name='interests',
+            field=models.JSONField(blank=True, default=tuple),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-09-01 23:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_alter_profile_interests'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['user', 'username'], name='profile_user_username_idx'),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
@@ -18,38 +18,51 @@ class Profile(models.Model):
     location = models.CharField(max_length=100, blank=True)
     birthday = models.DateField(null=True, blank=True)
     status_message = models.CharField(max_length=150, blank=True)
-    interests = models.JSONField(default=list, blank=True)
+    # default=tuple hands every fresh instance the shared immutable empty
+    # tuple (serialized as []) instead of allocating a new list per instance
+    interests = models.JSONField(default=tuple, blank=True)
     time_zone = models.CharField(max_length=50, blank=True)
     
     # Meta fields
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    class Meta:
+        indexes = [
+            # The OneToOne user FK already carries a unique index; this
+            # covers the frequent user -> username resolution without a
+            # heap fetch
+            models.Index(fields=['user', 'username'], name='profile_user_username_idx'),
+        ]
+
     def __str__(self):
         return f"Profile for {self.user.username}"
 
     def save(self, *args, **kwargs):
-        # If username is not set, use the user's username
-        if not self.username:
-            self.username = self.user.username
+        # If username is not set, use the user's username. When the user
+        # isn't already loaded, fetch just the username column rather than
+        # the whole auth_user row; the signal below sets username at
+        # creation, so this rarely runs at all
+        if not self.username and self.user_id:
+            if Profile.user.is_cached(self):
+                self.username = self.user.username
+            else:
+                self.username = User.objects.values_list(
+                    'username', flat=True
+                ).get(pk=self.user_id)
         super().save(*args, **kwargs)
 
-# Create Profile when User is created
+# Create Profile and UserSettings when User is created. Both rows go in
+# one transaction so signup pays for a single commit; get_or_create keeps
+# this idempotent without re-saving on every subsequent User.save()
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
-        Profile.objects.create(
-            user=instance, 
-            username=instance.username
-        )
-
-# Save Profile when User is saved
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    try:
-        instance.profile.save()
-    except Profile.DoesNotExist:
-        Profile.objects.create(
-            user=instance,
-            username=instance.username
-        )
\ No newline at end of file
+        # Imported here to avoid a circular import at app loading
+        from settings_app.models import UserSettings
+        with transaction.atomic():
+            Profile.objects.get_or_create(
+                user=instance,
+                defaults={'username': instance.username}
+            )
+            UserSettings.objects.get_or_create(user=instance)
\ No newline at end of file
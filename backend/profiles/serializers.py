@@ -1,9 +1,24 @@
+import copy
 from rest_framework import serializers
 from .models import Profile
 
 class ProfileSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(source='user.email', read_only=True)
-    
+
+    # Built field instances, shared across requests via deep copies
+    _cached_fields = None
+
+    def get_fields(self):
+        """
+        ModelSerializer.get_fields re-introspects the model and rebuilds
+        every field object per instantiation; build them once per class
+        and hand out copies, which bind to each instance as usual
+        """
+        cls = self.__class__
+        if cls._cached_fields is None:
+            cls._cached_fields = super().get_fields()
+        return copy.deepcopy(cls._cached_fields)
+
     class Meta:
         model = Profile
         fields = [
@@ -15,22 +30,30 @@ class ProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'email', 'created_at', 'updated_at']
     
     def validate_interests(self, value):
-        """Ensure interests is a list"""
+        """
+        Ensure interests is a list - JSONField accepts any JSON value,
+        so without this check a dict or scalar would be stored in a
+        field the rest of the app treats as a list
+        """
         if value is not None and not isinstance(value, list):
             raise serializers.ValidationError("Interests must be a list")
         return value
-    
-    def validate_birthday(self, value):
-        """Allow null birthday values"""
-        if value == '':
-            return None
-        return value
-    
+
+    # No validate_birthday hook: the view already coerces empty birthday
+    # strings to None on both parse paths
+
     def to_representation(self, instance):
         """Add absolute URL for profile picture"""
         ret = super().to_representation(instance)
-        if ret['profile_picture']:
-            request = self.context.get('request')
-            if request is not None:
-                ret['profile_picture'] = request.build_absolute_uri(ret['profile_picture'])
+        picture = ret['profile_picture']
+        if picture and picture.startswith('/'):
+            # Prefer the base URI the view resolved once per request;
+            # build_absolute_uri reparses request meta on every call
+            base_uri = self.context.get('base_uri')
+            if base_uri:
+                ret['profile_picture'] = base_uri + picture
+            else:
+                request = self.context.get('request')
+                if request is not None:
+                    ret['profile_picture'] = request.build_absolute_uri(picture)
         return ret
\ No newline at end of file
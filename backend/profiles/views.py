@@ -1,11 +1,12 @@
-import json
 import logging
+import orjson
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.authentication import TokenAuthentication
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
+from whisper_backend.renderers import ORJSONParser
 from .models import Profile
 from .serializers import ProfileSerializer
 
@@ -14,80 +15,91 @@ logger = logging.getLogger(__name__)
 class ProfileView(APIView):
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    parser_classes = [MultiPartParser, FormParser, ORJSONParser]
     
     def get(self, request):
         """Get the current user's profile"""
+        # The post_save signal guarantees a profile exists, so take the
+        # plain get() fast path; get_or_create (and its savepoint
+        # round-trips) only runs on the rare miss. The join on user is
+        # for the serializer, which reads user.email. Unexpected errors
+        # bubble to the framework handler, which already logs 500s
         try:
-            profile, created = Profile.objects.get_or_create(
+            profile = Profile.objects.select_related('user').get(user=request.user)
+        except Profile.DoesNotExist:
+            profile, _ = Profile.objects.get_or_create(
                 user=request.user,
                 defaults={'username': request.user.username}
             )
-            
-            serializer = ProfileSerializer(profile, context={'request': request})
-            return Response(serializer.data)
-        except Exception as e:
-            logger.exception(f"Error retrieving profile: {str(e)}")
-            return Response(
-                {"detail": str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+
+        serializer = ProfileSerializer(profile, context={
+            'request': request,
+            'base_uri': request.build_absolute_uri('/').rstrip('/'),
+        })
+        return Response(serializer.data)
     
     def patch(self, request):
         """Update the current user's profile"""
+        # Debug logging
+        logger.debug("User: %s", request.user.username)
+        logger.debug("Request data: %s", request.data)
+
+        # Get the profile, falling back to creation on the rare miss.
+        # No blanket try/except here - unexpected errors bubble to the
+        # framework handler, which already logs 500s
+        created = False
         try:
-            # Debug logging
-            logger.debug(f"User: {request.user.username}")
-            logger.debug(f"Request data: {request.data}")
-            
-            # Get or create profile
+            profile = Profile.objects.select_related('user').get(user=request.user)
+        except Profile.DoesNotExist:
             profile, created = Profile.objects.get_or_create(
                 user=request.user,
                 defaults={'username': request.user.username}
             )
-            logger.debug(f"Profile found: {not created}, Created new: {created}")
-            
-            # Create a mutable copy of request.data if needed
-            data = request.data.copy() if hasattr(request.data, 'copy') else request.data
-            
-            # Handle interests field - convert from string to list if needed
-            if 'interests' in data and isinstance(data['interests'], str):
-                try:
-                    # Parse JSON string to list
-                    data['interests'] = json.loads(data['interests'])
-                    logger.debug(f"Parsed interests: {data['interests']}")
-                except json.JSONDecodeError:
-                    logger.error("Invalid JSON format for interests")
-                    return Response(
-                        {"interests": ["Invalid JSON format"]},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            
-            # Handle empty string fields that should be null
-            date_fields = ['birthday']
-            for field in date_fields:
-                if field in data and data[field] == '':
-                    data[field] = None
-            
-            # Create serializer
-            serializer = ProfileSerializer(
-                profile, 
-                data=data, 
-                partial=True,
-                context={'request': request}
-            )
-            
-            if serializer.is_valid():
-                serializer.save()
-                logger.debug(f"Profile updated successfully: {serializer.data}")
-                return Response(serializer.data)
-            else:
-                logger.error(f"Serializer errors: {serializer.errors}")
-                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        
-        except Exception as e:
-            logger.exception(f"Error updating profile: {str(e)}")
-            return Response(
-                {"detail": str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+        logger.debug("Profile found: %s, Created new: %s", not created, created)
+
+        # Collect only the keys that need rewriting instead of copying
+        # the whole payload - multipart copies drag uploads along
+        mutations = {}
+
+        # Handle interests field - convert from string to list if
+        # needed. JSON clients already deliver a list, which skips the
+        # parse and the data overlay entirely
+        interests = request.data.get('interests')
+        if isinstance(interests, str):
+            try:
+                # Parse JSON string to list
+                mutations['interests'] = orjson.loads(interests)
+                logger.debug("Parsed interests: %s", mutations['interests'])
+            except orjson.JSONDecodeError:
+                logger.error("Invalid JSON format for interests")
+                return Response(
+                    {"interests": ["Invalid JSON format"]},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        # Handle empty string fields that should be null
+        date_fields = ['birthday']
+        for field in date_fields:
+            if request.data.get(field) == '':
+                mutations[field] = None
+
+        data = {**request.data, **mutations} if mutations else request.data
+
+        # Create serializer
+        serializer = ProfileSerializer(
+            profile,
+            data=data,
+            partial=True,
+            context={
+                'request': request,
+                'base_uri': request.build_absolute_uri('/').rstrip('/'),
+            }
+        )
+
+        if serializer.is_valid():
+            serializer.save()
+            logger.debug("Profile updated successfully: %s", serializer.data)
+            return Response(serializer.data)
+
+        logger.error("Serializer errors: %s", serializer.errors)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
@@ -1,7 +1,5 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
-from django.dispatch import receiver
 
 User = get_user_model()
 
@@ -42,10 +40,5 @@ class UserSettings(models.Model):
     def __str__(self):
         return f"{self.user.username}'s settings"
 
-
-# Signal to create settings for new users
-@receiver(post_save, sender=User)
-def create_user_settings(sender, instance, created, **kwargs):
-    """Create UserSettings when a new User is created"""
-    if created:
-        UserSettings.objects.create(user=instance)
\ No newline at end of file
+# UserSettings creation for new users lives in profiles.models alongside
+# Profile creation, so both rows share one transaction on signup
\ No newline at end of file
@@ -4,6 +4,8 @@ from rest_framework.views import APIView
 from rest_framework.generics import RetrieveUpdateAPIView
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import check_password
+from django.db import transaction
+from django.utils import timezone
 from .models import UserSettings
 from .serializers import (
     UserSettingsSerializer,
@@ -16,6 +18,17 @@ from .serializers import (
 
 User = get_user_model()
 
+def get_user_settings(user):
+    """
+    Fetch the user's settings. The post_save signal guarantees they exist,
+    so the plain get() is the fast path; get_or_create only runs on the
+    rare miss (e.g. users created before the signal was added)
+    """
+    try:
+        return UserSettings.objects.select_related('user').get(user=user)
+    except UserSettings.DoesNotExist:
+        return UserSettings.objects.get_or_create(user=user)[0]
+
 class UserSettingsView(RetrieveUpdateAPIView):
     """View to get and update all user settings"""
     serializer_class = UserSettingsSerializer
@@ -23,35 +36,62 @@ class UserSettingsView(RetrieveUpdateAPIView):
     
     def get_object(self):
         """Get the settings for the current user"""
-        # Settings should already exist due to the post_save signal
-        return self.request.user.settings
+        return get_user_settings(self.request.user)
 
 
-class AppearanceSettingsView(RetrieveUpdateAPIView):
-    """View to get and update appearance settings"""
-    serializer_class = AppearanceSettingsSerializer
+class SettingsSectionView(RetrieveUpdateAPIView):
+    """
+    Base view for the per-section settings endpoints.
+    Updates go through a single queryset UPDATE on the validated fields -
+    the sections only expose a handful of bool/choice columns, so there's
+    no need to fetch, assign and re-save the full instance
+    """
     permission_classes = [permissions.IsAuthenticated]
-    
+
     def get_object(self):
-        return self.request.user.settings
+        return get_user_settings(self.request.user)
 
+    def retrieve(self, request, *args, **kwargs):
+        # Project just this section's columns straight from the database;
+        # no model instance or serializer pass needed for a read
+        fields = self.get_serializer_class().Meta.fields
+        row = UserSettings.objects.filter(user=request.user).values(*fields).first()
+        if row is None:
+            settings_obj = get_user_settings(request.user)
+            row = {field: getattr(settings_obj, field) for field in fields}
+        return Response(row)
 
-class NotificationSettingsView(RetrieveUpdateAPIView):
-    """View to get and update notification settings"""
-    serializer_class = NotificationSettingsSerializer
-    permission_classes = [permissions.IsAuthenticated]
-    
-    def get_object(self):
-        return self.request.user.settings
+    def update(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        if serializer.validated_data:
+            # Queryset update() skips auto_now, so bump updated_at by hand
+            UserSettings.objects.filter(user=request.user).update(
+                updated_at=timezone.now(),
+                **serializer.validated_data
+            )
+        return Response(serializer.validated_data)
 
 
-class PrivacySettingsView(RetrieveUpdateAPIView):
-    """View to get and update privacy settings"""
-    serializer_class = PrivacySettingsSerializer
-    permission_classes = [permissions.IsAuthenticated]
-    
-    def get_object(self):
-        return self.request.user.settings
+def make_settings_view(serializer_cls, doc):
+    """
+    Build a settings-section view bound to the given serializer.
+    The sections differ only in which serializer they expose, so generate
+    them instead of re-declaring identical class bodies
+    """
+    return type(
+        serializer_cls.__name__.replace('Serializer', 'View'),
+        (SettingsSectionView,),
+        {'__doc__': doc, 'serializer_class': serializer_cls},
+    )
+
+
+AppearanceSettingsView = make_settings_view(
+    AppearanceSettingsSerializer, "View to get and update appearance settings")
+NotificationSettingsView = make_settings_view(
+    NotificationSettingsSerializer, "View to get and update notification settings")
+PrivacySettingsView = make_settings_view(
+    PrivacySettingsSerializer, "View to get and update privacy settings")
 
 
 class ChangePasswordView(APIView):
@@ -62,7 +102,9 @@ class ChangePasswordView(APIView):
         serializer = PasswordChangeSerializer(data=request.data)
         
         if serializer.is_valid():
-            # Check if current password is correct
+            # Check if current password is correct. request.user is already
+            # materialized by authentication, so read the hash from it
+            # rather than refetching the row
             user = request.user
             if not check_password(serializer.validated_data['current_password'], user.password):
                 return Response(
@@ -70,9 +112,9 @@ class ChangePasswordView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Set the new password
+            # Set the new password; only the password column needs writing
             user.set_password(serializer.validated_data['new_password'])
-            user.save()
+            user.save(update_fields=['password'])
             
             return Response(
                 {"message": "Password updated successfully"}, 
@@ -98,8 +140,11 @@ class DeleteAccountView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Delete the user
-            user.delete()
+            # Delete the user; a queryset delete inside one transaction lets
+            # the database cascade to profile/settings without materializing
+            # each related object first
+            with transaction.atomic():
+                User.objects.filter(pk=user.pk).delete()
             
             return Response(
                 {"message": "Account deleted successfully"}, 
@@ -109,9 +109,13 @@ CHANNEL_LAYERS = {
     'default': {
         # Use the in-memory layer for development
         'BACKEND': 'channels.layers.InMemoryChannelLayer',
-        
-        # For production, use Redis backend (requires channels_redis):
-        # 'BACKEND': 'channels_redis.core.RedisChannelLayer',
+
+        # For production, use the Redis PubSub backend (requires channels_redis).
+        # Prefer it over channels_redis.core.RedisChannelLayer: the core layer
+        # does per-channel Redis round-trips on every group_send, while PubSub
+        # holds one subscription per process and fans out server-side, which
+        # is much cheaper for the chat_{id} and online_status groups:
+        # 'BACKEND': 'channels_redis.pubsub.RedisPubSubChannelLayer',
         # 'CONFIG': {
         #     "hosts": [('127.0.0.1', 6379)],
         # },
@@ -196,6 +200,17 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
+    # orjson-backed JSON handling; several times faster than the stdlib
+    # json behind DRF's defaults
+    'DEFAULT_RENDERER_CLASSES': [
+        'whisper_backend.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'whisper_backend.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',  
         'rest_framework_simplejwt.authentication.JWTAuthentication',  